@@ -1,256 +1,252 @@
+import asyncio
 import requests
-import time
+from requests.adapters import HTTPAdapter
 import math
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from sqlalchemy import text
 
+from scripts.checkpoint import load_checkpoint, save_checkpoint
 from scripts.get_recipe_links import get_recipe_links
-from scripts.get_recipe_name import get_recipe_name
-from scripts.get_recipe_cooking_time import get_recipe_cooking_time
-from scripts.get_recipe_nutritional_values import get_recipe_nutritional_values
-from scripts.get_recipe_categories import get_recipe_categories
-from scripts.get_recipe_ingredients import get_recipe_ingredients
-from scripts.sql_connection import Conn, engine
+from scripts.retry import get_with_retry
+from scripts.scrape_recipes import scrape_recipes
 
 
 # url of the BBC Good Food recipes page
 filtered_page_url = 'https://www.bbcgoodfood.com/search?'
 base_url = 'https://www.bbcgoodfood.com'
 
-# Define the maximum number of retry attempts and delay between retries
-max_retries = 3
-retry_delay = 5  # in seconds
-
-for attempt in range(max_retries):
-    try:
-        # Get and Parse the HTML using Beautiful Soup
-        base_page_response = requests.get(filtered_page_url)
-        base_page_response.raise_for_status()
-        base_soup = BeautifulSoup(base_page_response.content, 'html.parser')
-        
-        # Break the retry loop if the request is successful
-        break
-    except requests.exceptions.RequestException as e:
-        print(f"An error occurred for this website: {e}")
-        if attempt < max_retries - 1:
-            print(f"Retrying in {retry_delay} seconds...")
-            time.sleep(retry_delay)
+# Links, listing page validators and scraped recipes saved by the previous run
+checkpoint_path = 'checkpoint.json'
+
+# Only build the tree for the recipe links on the listing pages
+LISTING_STRAINER = SoupStrainer('a', attrs={'class': 'link d-block'})
+
+
+def main():
+    # Imported here so the parsing worker processes don't each open a database connection
+    from scripts.sql_connection import engine
+
+    # Load the links, listing page validators and scraped recipes saved by the previous run
+    checkpoint = load_checkpoint(checkpoint_path)
+    cached_pages = checkpoint['pages']
+    cached_recipes = checkpoint['recipes']
+
+    # Share one pooled keep-alive connection to the site across every request
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=20, max_retries=0))
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (compatible; bbc-good-food-scraper)',
+        # Ask for compressed pages; brotli decoding needs the brotli package installed
+        'Accept-Encoding': 'br, gzip, deflate',
+    })
+
+    # Get and Parse the HTML using Beautiful Soup
+    base_page_response = get_with_retry(session, filtered_page_url)
+    if base_page_response is None:
+        print("Exiting. Please try again later.")
+        exit(1)
+    base_soup = BeautifulSoup(base_page_response.content, 'lxml')
+
+    # How many pages are there?
+    results = base_soup.select_one('p.search-results__results-text').text
+    results_list = results.split()
+    number_of_recipes = int(results_list[5])
+    number_of_pages = math.ceil(number_of_recipes / 30)
+
+    # List and Dict for storage
+    used_recipe_links = set()
+    recipe_links = []
+    recipe_names = []
+    successful_links = []
+    recipe_cooking_times = []
+    recipe_category_information = {}
+    recipe_ingredients = []
+    nutritional_desired_keys = ["kcal", "fat", "saturates", "carbs", "sugars", "fibre", "protein", "salt"]
+    nutrition_cols = {key: [] for key in nutritional_desired_keys}
+
+    # Maximum number of recipe pages in flight at once
+    concurrency = 5
+
+    # Skip listing pages 2 onwards if the recipe count hasn't changed since the last complete run
+    if number_of_recipes == checkpoint['count'] and checkpoint['used']:
+        print('Recipe count unchanged since the last run, reusing the saved recipe links.')
+        page_list = []
+        recipe_links.extend(checkpoint['used'])
+        used_recipe_links.update(checkpoint['used'])
+
+        # New recipes appear on page 1, which is already parsed, so still pick up any links not seen before
+        new_recipe_links = sorted(get_recipe_links(base_soup, base_url) - used_recipe_links)
+        recipe_links.extend(new_recipe_links)
+        used_recipe_links.update(new_recipe_links)
+    else:
+        # The base page is page 1 of the results, so take its links now and fetch the rest from page 2
+        used_recipe_links |= get_recipe_links(base_soup, base_url)
+        recipe_links.extend(sorted(used_recipe_links))
+
+        # list of page numbers
+        page_list = list(range(2, number_of_pages + 1))
+    pages_complete = True
+
+    # Loop through the base pages
+    for page_number in page_list:
+        print(f'Scraping page {page_number} of {number_of_pages}...')
+        page_url = filtered_page_url + '&page=' + str(page_number)
+
+        # Ask the server to skip the body if the page is unchanged since the last run
+        cached_page = cached_pages.get(page_url, {})
+        conditional_headers = {}
+        if cached_page.get('etag'):
+            conditional_headers['If-None-Match'] = cached_page['etag']
+        if cached_page.get('last_modified'):
+            conditional_headers['If-Modified-Since'] = cached_page['last_modified']
+
+        # Get and Parse the HTML for each page
+        page_response = get_with_retry(session, page_url, headers=conditional_headers)
+        if page_response is None:
+            print("Skipping to the next page.")
+            pages_complete = False
+            continue
+
+        if page_response.status_code == 304:
+            links = set(cached_page['links'])
         else:
-            print(f"Max retry attempts reached for {filtered_page_url}. Exiting. Please try again later.")
-            exit(1)  # You can choose to exit the script if retries are exhausted
-
-# Add a delay of 1 second after successful request and parsing
-time.sleep(1)
-
-# How many pages are there?
-results = base_soup.find('p', attrs={'class':'search-results__results-text body-copy-bold mb-md mt-reset d-inline-block'}).text
-results_list = results.split()
-number_of_recipes = int(results_list[5])
-number_of_pages = math.ceil(number_of_recipes / 30)
-
-# list of page numbers
-page_list = list(range(1, number_of_pages + 1))
-
-# List and Dict for storage
-used_recipe_links = []
-recipe_names = []
-successful_links = []
-recipe_cooking_times = []
-recipe_nutritional_data = []
-recipe_category_information = {}
-recipe_ingredients = []
-nutritional_desired_keys = ["kcal", "fat", "saturates", "carbs", "sugars", "fibre", "protein", "salt"]
-
-
-# Loop through the base pages
-for page_number in page_list:
-    print(f'Scraping page {page_number} of {len(page_list)}...')
-    page_url = filtered_page_url + '&page=' + str(page_number)
-
-    for attempt in range(max_retries):
-        try:
-            # Get and Parse the HTML for each page
-            page_response = requests.get(page_url)
-            page_response.raise_for_status()
-            soup = BeautifulSoup(page_response.content, 'html.parser')
-            
-            # Break the retry loop if the request is successful
-            break
-        except requests.exceptions.RequestException as e:
-            print(f"An error occurred for this page url: {e}")
-            if attempt < max_retries - 1:
-                print(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
+            soup = BeautifulSoup(page_response.content, 'lxml', parse_only=LISTING_STRAINER)
+            links = get_recipe_links(soup, base_url)
+            cached_pages[page_url] = {
+                'etag': page_response.headers.get('ETag'),
+                'last_modified': page_response.headers.get('Last-Modified'),
+                'links': sorted(links),
+            }
+
+        # Collect the recipe links not already seen on a previous page, sorted so recipe ids are stable between runs
+        new_recipe_links = sorted(links - used_recipe_links)
+        recipe_links.extend(new_recipe_links)
+        used_recipe_links |= set(new_recipe_links)
+
+
+    # Send GET requests for the recipe links not scraped on a previous run concurrently and parse their HTML
+    links_to_scrape = [link for link in recipe_links if link not in cached_recipes]
+    print(f'Scraping {len(links_to_scrape)} recipes ({len(recipe_links) - len(links_to_scrape)} already scraped)...')
+    results = asyncio.run(scrape_recipes(links_to_scrape, concurrency, dict(session.headers)))
+
+    for link, result in zip(links_to_scrape, results):
+        if isinstance(result, Exception):
+            print(f"An error occurred while fetching or parsing {link}: {result}")
+        elif result is not None:
+            cached_recipes[link] = result
+
+    # Save progress so the next run can skip what has already been scraped
+    save_checkpoint(checkpoint_path, {
+        'count': number_of_recipes if pages_complete else None,
+        'used': recipe_links,
+        'pages': cached_pages,
+        'recipes': {link: cached_recipes[link] for link in recipe_links if link in cached_recipes},
+    })
+
+    # Collect the results in link order
+    for link in recipe_links:
+        result = cached_recipes.get(link)
+        if result is None:
+            continue
+
+        recipe_names.append(result['name'])
+        recipe_cooking_times.append(result['cooking_time'])
+        recipe_ingredients.append(result['ingredients'])
+
+        # Append the recipe's nutritional values straight onto the nutrition columns
+        for key in nutritional_desired_keys:
+            nutrition_cols[key].append(result['nutrition'].get(key))
+
+        # Fill in the dictionary of recipe category information
+        for category, status in result['categories'].items():
+            if category in recipe_category_information:
+                recipe_category_information[category].append(status)
             else:
-                print(f"Max retry attempts reached for {page_url}. Skipping to the next page.")
-                break
-
-    # Add a delay of 1 second after successful request and parsing
-    time.sleep(1)
-
-    # Create a list of recipe links
-    new_recipe_links = []
-    links = get_recipe_links(soup, base_url)
-    for link in links:
-        if link not in used_recipe_links:
-            new_recipe_links.append(link)
-
-
-    # Loop through the recipe link list sending GET requests and parsing the HTML of specific recipes
-    for link in new_recipe_links:
-        for attempt in range(max_retries):
-            try:
-                recipe_response = requests.get(link)
-                recipe_response.raise_for_status()
-                recipe_soup = BeautifulSoup(recipe_response.content, 'html.parser')
-
-                recipe_name = get_recipe_name(recipe_soup)
-                recipe_names.append(recipe_name)
-
-                recipe_cooking_time = get_recipe_cooking_time(recipe_response)
-                recipe_cooking_times.append(recipe_cooking_time)
-
-                nutrition_name, nutrition_values = get_recipe_nutritional_values(recipe_soup)
-                
-                categories = get_recipe_categories(recipe_soup)
-
-                ingredients = get_recipe_ingredients(recipe_soup)
-                recipe_ingredients.append(ingredients)
-
-                # Create an empty dictionary for the current recipe nutrition
-                recipe_nutritional_values = {key: None for key in nutritional_desired_keys}
-
-                # Fill in the dictionary of recipe nutritional values
-                for name, value in zip(nutrition_name, nutrition_values):
-                    if name.text in recipe_nutritional_values:
-                        recipe_nutritional_values[name.text] = value.text
-
-                # Add the dictionary for the current recipe to the list
-                recipe_nutritional_data.append(recipe_nutritional_values)
-
-                # Fill in the dictionary of recipe category information
-                for category, status in categories.items():
-                    if category in recipe_category_information:
-                        recipe_category_information[category].append(status)
-                    else:
-                        recipe_category_information[category] = [status]
-
-                # Add link to successful_links list
-                successful_links.append(link)
-
-                # Break the retry loop if the request is successful
-                break
-            except requests.exceptions.RequestException as e:
-                print(f"An error occurred for this recipe link: {e}")
-                if attempt < max_retries - 1:
-                    print(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    print(f"Max retry attempts reached for {link}. Moving on to the next link.")
-                    break
-
-        # Add the link to the used links list
-        used_recipe_links.append(link)
-
-        # Add a delay of 1 second between requests (outside of the retry loop)
-        time.sleep(1)
-
-
-print('Transforming the data...')
-
-# Initialize the combined dictionary for nutrition with keys
-keys = ["kcal", "fat", "saturates", "carbs", "sugars", "fibre", "protein", "salt"]
-clean_recipe_nutritional_values = {key: [] for key in keys}
-
-# Iterate through the list of dictionaries
-for recipe_data in recipe_nutritional_data:
-    for key in keys:
-        value = recipe_data.get(key)
-        if value is None:
-            clean_recipe_nutritional_values[key].append(None)
-        else:
-            if key != 'kcal':
-                value = value[:-1]  # Remove 'g' from values
-            clean_recipe_nutritional_values[key].append(value)
-
-# Rename the keys
-final_nutrition_dict = {
-    "kcal": "kcal",
-    "fat": "Fat(g)",
-    "saturates": "Saturates(g)",
-    "carbs": "Carbs(g)",
-    "sugars": "Sugars(g)",
-    "fibre": "Fibre(g)",
-    "protein": "Protein(g)",
-    "salt": "Salt(g)",
-}
-
-# Apply the key renaming to the dictionary
-final_nutrition_dict = {
-    final_nutrition_dict[key]: values
-    for key, values in clean_recipe_nutritional_values.items()
-}
-
-# Create a DataFrame for recipe information
-print('Connecting to Database...')
-
-recipe_info_data = {
-    'RecipeName': recipe_names,
-    'RecipeLink': successful_links,
-    'CookingTime': recipe_cooking_times,
-    **recipe_category_information  # Unpack the dictionary
-}
-recipe_info_df = pd.DataFrame(recipe_info_data)
-
-# Create a DataFrame for nutrition
-nutrition_df = pd.DataFrame(final_nutrition_dict)
-
-# Create a DataFrame for ingredients
-    # Create a list of recipe_ids
-recipe_ids = range(1, len(recipe_ingredients) + 1)
-
-    # Flatten the list of lists and assign recipe_ids
-flattened_ingredients = [(recipe_id, ingredient) for recipe_id, ingredients in zip(recipe_ids, recipe_ingredients) for ingredient in ingredients]
-
-    # Create a DataFrame with columns "recipe_id" and "Ingredient"
-ingredients_df = pd.DataFrame(flattened_ingredients, columns=['recipe_id', 'Ingredient'])
-
-# Add recipe_id column based on index to each DataFrame starting from 1
-recipe_info_df.insert(0, 'recipe_id', recipe_info_df.index + 1)
-nutrition_df.insert(0, 'recipe_id', nutrition_df.index + 1)
-
-# Define table names
-recipe_info_table_name = "recipe_info"
-nutrition_table_name = "nutrition"
-ingredients_table_name = 'ingredients'
-
-trans = Conn.begin()
-
-# Define the SQL statement to delete info in the 'nutrition' and 'recipe_info' tables
-delete_ingredients = text('DELETE FROM ingredients')
-delete_nutrition = text('DELETE FROM nutrition')
-delete_recipe_info = text('DELETE FROM recipe_info')
-
-# Execute the SQL statement
-Conn.execute(delete_ingredients)
-Conn.execute(delete_nutrition)
-Conn.execute(delete_recipe_info)
-
-# Commit the transaction
-trans.commit()
-
-# Insert new data into the 'recipe_info' table
-recipe_info_df.to_sql(recipe_info_table_name, engine, if_exists='append', index=False)
-print("Data added to 'recipe_info' table successfully.")
-
-# Insert new data into the 'nutrition' table
-nutrition_df.to_sql(nutrition_table_name, engine, if_exists='append', index=False)
-print("Data added to 'nutrition' table successfully.")
-
-# Insert new data into the 'ingredients' table
-ingredients_df.to_sql(ingredients_table_name, engine, if_exists='append', index=False)
-print("Data added to 'ingredients' table successfully.")
-
-# Dispose of the SQLAlchemy engine to release resources
-engine.dispose()
\ No newline at end of file
+                recipe_category_information[category] = [status]
+
+        # Add link to successful_links list
+        successful_links.append(link)
+
+
+    print('Transforming the data...')
+
+    # Create a DataFrame for nutrition and convert the values to numbers, removing 'g' from the gram columns
+    nutrition_df = pd.DataFrame(nutrition_cols, dtype=object)
+    nutrition_df['kcal'] = pd.to_numeric(nutrition_df['kcal'], errors='coerce').astype('Int64')
+    for key in nutritional_desired_keys:
+        if key == 'kcal':
+            continue
+        nutrition_df[key] = pd.to_numeric(nutrition_df[key].str.rstrip('g'), errors='coerce')
+
+    # Rename the columns
+    final_nutrition_dict = {
+        "kcal": "kcal",
+        "fat": "Fat(g)",
+        "saturates": "Saturates(g)",
+        "carbs": "Carbs(g)",
+        "sugars": "Sugars(g)",
+        "fibre": "Fibre(g)",
+        "protein": "Protein(g)",
+        "salt": "Salt(g)",
+    }
+    nutrition_df = nutrition_df.rename(columns=final_nutrition_dict)
+
+    # Create a DataFrame for recipe information
+    print('Connecting to Database...')
+
+    recipe_info_data = {
+        'RecipeName': recipe_names,
+        'RecipeLink': successful_links,
+        'CookingTime': recipe_cooking_times,
+        **recipe_category_information  # Unpack the dictionary
+    }
+    recipe_info_df = pd.DataFrame(recipe_info_data)
+
+    # Create a DataFrame for ingredients
+        # Create a list of recipe_ids
+    recipe_ids = range(1, len(recipe_ingredients) + 1)
+
+        # Flatten the list of lists and assign recipe_ids
+    flattened_ingredients = [(recipe_id, ingredient) for recipe_id, ingredients in zip(recipe_ids, recipe_ingredients) for ingredient in ingredients]
+
+        # Create a DataFrame with columns "recipe_id" and "Ingredient"
+    ingredients_df = pd.DataFrame(flattened_ingredients, columns=['recipe_id', 'Ingredient'])
+
+    # Add recipe_id column based on index to each DataFrame starting from 1
+    recipe_info_df.insert(0, 'recipe_id', recipe_info_df.index + 1)
+    nutrition_df.insert(0, 'recipe_id', nutrition_df.index + 1)
+
+    # Define table names
+    recipe_info_table_name = "recipe_info"
+    nutrition_table_name = "nutrition"
+    ingredients_table_name = 'ingredients'
+
+    # Rows sent per batch; the engine uses pyodbc fast_executemany so each batch goes over as a single parameter array
+    insert_chunksize = 1000
+
+    # Replace the contents of all three tables in a single transaction so a failed insert leaves the old data in place
+    with engine.begin() as conn:
+        # The child tables can be truncated; SQL Server won't truncate 'recipe_info' while foreign keys reference it
+        conn.execute(text('TRUNCATE TABLE ingredients'))
+        conn.execute(text('TRUNCATE TABLE nutrition'))
+        conn.execute(text('DELETE FROM recipe_info'))
+
+        # Insert new data into the 'recipe_info' table
+        recipe_info_df.to_sql(recipe_info_table_name, conn, if_exists='append', index=False, chunksize=insert_chunksize)
+
+        # Insert new data into the 'nutrition' table
+        nutrition_df.to_sql(nutrition_table_name, conn, if_exists='append', index=False, chunksize=insert_chunksize)
+
+        # Insert new data into the 'ingredients' table
+        ingredients_df.to_sql(ingredients_table_name, conn, if_exists='append', index=False, chunksize=insert_chunksize)
+
+    print("Data added to 'recipe_info', 'nutrition' and 'ingredients' tables successfully.")
+
+    # Close the HTTP session and dispose of the SQLAlchemy engine to release resources
+    session.close()
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+import os
+
+import orjson
+
+
+# Load the checkpoint left by the previous run, or an empty one if there isn't one
+def load_checkpoint(path):
+    checkpoint = {'count': None, 'used': [], 'pages': {}, 'recipes': {}}
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            checkpoint.update(orjson.loads(f.read()))
+    return checkpoint
+
+
+# Save the checkpoint, writing to a temporary file first so a crash can't leave it half written
+def save_checkpoint(path, checkpoint):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(checkpoint))
+    os.replace(tmp_path, path)
@@ -1,14 +1,15 @@
 import re
-from lxml import html
+
+# Path from <main> to the prep and cook time elements, mirroring the page layout
+TIMES_PATH = 'main > div:nth-of-type(2) > section > div > div:nth-of-type(4) > ul:nth-of-type(1) > li:nth-of-type(1) > div > div:nth-of-type(2) > ul'
+PREP_TIME_SELECTOR = TIMES_PATH + ' > li:nth-of-type(1) > span:nth-of-type(2) > time'
+COOK_TIME_SELECTOR = TIMES_PATH + ' > li:nth-of-type(2) > span:nth-of-type(2) > time'
 
 # Get cooking time
-def get_recipe_cooking_time(response):
-    # Convert the soup to an lxml element tree
-    tree = html.fromstring(response.content)
-    
-    # Locate the cook and prep times
-    prep_times = tree.xpath('/html/body/div/div[4]/main/div[2]/section/div/div[4]/ul[1]/li[1]/div/div[2]/ul/li[1]/span[2]/time')
-    cook_times = tree.xpath('/html/body/div/div[4]/main/div[2]/section/div/div[4]/ul[1]/li[1]/div/div[2]/ul/li[2]/span[2]/time')
+def get_recipe_cooking_time(soup):
+    # Locate the cook and prep times on the already parsed page
+    prep_times = soup.select(PREP_TIME_SELECTOR)
+    cook_times = soup.select(COOK_TIME_SELECTOR)
 
     cook = []
     prep = []
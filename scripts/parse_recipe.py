@@ -0,0 +1,90 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+from scripts.get_recipe_cooking_time import get_recipe_cooking_time
+
+# Only build the tree for the main recipe content, skipping the navigation, footer and adverts
+RECIPE_STRAINER = SoupStrainer('main')
+
+# Class attributes of the elements holding each recipe field
+NAME_CLASS = 'heading-1'
+NUTRITION_KEY_CLASS = 'key-value-blocks__key'
+NUTRITION_VALUE_CLASS = 'key-value-blocks__value'
+CATEGORY_CLASS = 'terms-icons-list__text d-flex align-items-center'
+DIFFICULTY_CLASS = 'icon-with-text__children'
+INGREDIENT_CLASS = 'pb-xxs pt-xxs list-item list-item--separator'
+
+
+# Turn the category and difficulty labels into the recipe category columns
+def get_categories(category_text, difficulty_text):
+    categories_dict = {}
+
+    if 'Healthy' in category_text:
+        categories_dict['HealthStatus'] = 'Healthy'
+    else:
+        categories_dict['HealthStatus'] = None
+
+    if 'Vegan' in category_text:
+        categories_dict['Diet'] = 'Vegan'
+    elif 'Vegetarian' in category_text:
+        categories_dict['Diet'] = 'Vegetarian'
+    else:
+        categories_dict['Diet'] = 'Regular'
+
+    if 'Easy' in difficulty_text:
+        categories_dict['Difficulty'] = 'Easy'
+    elif 'More effort' in difficulty_text:
+        categories_dict['Difficulty'] = 'More effort'
+    elif 'A challenge' in difficulty_text:
+        categories_dict['Difficulty'] = 'A challenge'
+    else:
+        categories_dict['Difficulty'] = 'Not given'
+    return categories_dict
+
+
+# Get the name, cooking time, nutrition, categories and ingredients of a recipe in a single walk of the soup
+def parse_all(soup):
+    name = None
+    nutrition_name = []
+    nutrition_values = []
+    category_text = []
+    difficulty_text = []
+    ingredients = []
+
+    for tag in soup.find_all(['h1', 'td', 'span', 'div', 'li']):
+        # Single class names match any of the element's classes, multi-class strings the whole attribute, as in find_all
+        classes = tag.get('class', [])
+        tag_class = ' '.join(classes)
+        if tag.name == 'h1':
+            if name is None and NAME_CLASS in classes:
+                name = tag.text
+        elif tag.name == 'td':
+            if NUTRITION_KEY_CLASS in classes:
+                nutrition_name.append(tag.text)
+            elif NUTRITION_VALUE_CLASS in classes:
+                nutrition_values.append(tag.text)
+        elif tag.name == 'span':
+            if tag_class == CATEGORY_CLASS:
+                category_text.append(tag.text)
+        elif tag.name == 'div':
+            if DIFFICULTY_CLASS in classes:
+                difficulty_text.append(tag.text)
+        elif tag_class == INGREDIENT_CLASS:
+            ingredients.append(tag.text)
+
+    if name is None:
+        raise ValueError('Recipe name not found on the page')
+
+    return {
+        'name': name,
+        'cooking_time': get_recipe_cooking_time(soup),
+        'nutrition': dict(zip(nutrition_name, nutrition_values)),
+        'categories': get_categories(category_text, difficulty_text),
+        'ingredients': ingredients,
+    }
+
+
+# Parse the raw HTML of a recipe page into its fields
+# Kept at module level so it can be pickled and run in a worker process
+def parse_all_bytes(html):
+    recipe_soup = BeautifulSoup(html, 'lxml', parse_only=RECIPE_STRAINER)
+    return parse_all(recipe_soup)
@@ -0,0 +1,27 @@
+import asyncio
+
+
+# Pace requests to a single host, slowing down on 429/503 and speeding back up on success
+class AdaptiveRateLimiter:
+    def __init__(self, initial_delay=1.0, min_delay=0.2, max_delay=30.0, decay=0.95):
+        self.current_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decay = decay
+        self.lock = asyncio.Lock()
+
+    # Sleep for the current delay before issuing a request
+    async def wait(self):
+        async with self.lock:
+            delay = self.current_delay
+        await asyncio.sleep(delay)
+
+    # Gradually reopen the rate after a successful response
+    async def on_success(self):
+        async with self.lock:
+            self.current_delay = max(self.min_delay, self.current_delay * self.decay)
+
+    # Halve the rate when the server signals it is overloaded, slowing every worker to any Retry-After it asked for
+    async def on_throttle(self, retry_after=None):
+        async with self.lock:
+            self.current_delay = min(self.max_delay, max(self.current_delay * 2, retry_after or 0.0))
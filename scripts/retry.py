@@ -0,0 +1,105 @@
+import asyncio
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import httpx
+import requests
+
+# Status codes worth retrying: rate limiting and server-side errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Status codes meaning the server wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+
+# Seconds requested by a Retry-After header, or None if absent or unparseable
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    # asctime and '-0000' dates come back naive; HTTP dates are always in UTC
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+# Exponential backoff with full jitter, deferring to Retry-After when the server sends one
+# The cap only bounds our own backoff; a server-provided Retry-After is always waited out in full
+def backoff_delay(attempt, base=1.0, cap=30.0, retry_after=None):
+    if retry_after is not None:
+        return retry_after
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+# GET a url with a requests session, returning the response or None once retries are exhausted
+def get_with_retry(session, url, max_retries=3, base=1.0, cap=30.0, headers=None):
+    for attempt in range(max_retries):
+        retry_after = None
+        try:
+            response = session.get(url, headers=headers, timeout=15)
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                return response
+            print(f"Received HTTP {response.status_code} for {url}")
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        except requests.exceptions.HTTPError as e:
+            # Client errors other than 429 will not succeed on a retry
+            print(f"An error occurred for {url}: {e}")
+            return None
+        except requests.exceptions.RequestException as e:
+            print(f"An error occurred for {url}: {e}")
+
+        if attempt < max_retries - 1:
+            delay = backoff_delay(attempt, base, cap, retry_after)
+            print(f"Retrying in {delay:.1f} seconds...")
+            time.sleep(delay)
+
+    print(f"Max retry attempts reached for {url}.")
+    return None
+
+
+# GET a url with an httpx async client, returning the body bytes or None once retries are exhausted
+# If a limiter is given, every request is paced by it and it is fed the server's throttling signals
+async def fetch_with_retry(client, sem, url, max_retries=3, base=1.0, cap=30.0, limiter=None):
+    for attempt in range(max_retries):
+        retry_after = None
+        try:
+            async with sem:
+                if limiter is not None:
+                    await limiter.wait()
+                response = await client.get(url)
+            if response.status_code not in RETRY_STATUSES:
+                response.raise_for_status()
+                if limiter is not None:
+                    await limiter.on_success()
+                return response.content
+            print(f"Received HTTP {response.status_code} for {url}")
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if limiter is not None and response.status_code in THROTTLE_STATUSES:
+                await limiter.on_throttle(retry_after)
+        except httpx.HTTPStatusError as e:
+            # Client errors other than 429 will not succeed on a retry
+            print(f"An error occurred for {url}: {e}")
+            return None
+        except httpx.RequestError as e:
+            print(f"An error occurred for {url}: {e}")
+
+        if attempt < max_retries - 1:
+            delay = backoff_delay(attempt, base, cap, retry_after)
+            print(f"Retrying in {delay:.1f} seconds...")
+            await asyncio.sleep(delay)
+
+    print(f"Max retry attempts reached for {url}.")
+    return None
@@ -0,0 +1,36 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+from scripts.parse_recipe import parse_all_bytes
+from scripts.retry import fetch_with_retry
+from scripts.rate_limiter import AdaptiveRateLimiter
+
+
+# Fetch a single recipe page and parse it in the process pool
+async def scrape_recipe(client, sem, limiter, pool, url):
+    html = await fetch_with_retry(client, sem, url, limiter=limiter)
+    if html is None:
+        print("Moving on to the next link.")
+        return None
+
+    # Parsing is CPU-bound, so hand it to a worker process and keep the event loop fetching
+    # Only the bytes and the small result dict cross the process boundary, never the soup
+    loop = asyncio.get_running_loop()
+    parsed = await loop.run_in_executor(pool, parse_all_bytes, html)
+    return {'link': url, **parsed}
+
+
+# Scrape many recipe pages concurrently, returning results in the same order as the links
+async def scrape_recipes(links, concurrency=5, headers=None):
+    sem = asyncio.Semaphore(concurrency)
+    limiter = AdaptiveRateLimiter()
+    # HTTP/2 multiplexes the concurrent requests as streams over a single connection to the site
+    limits = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        async with httpx.AsyncClient(http2=True, limits=limits, timeout=15.0, headers=headers, follow_redirects=True) as client:
+            tasks = [scrape_recipe(client, sem, limiter, pool, link) for link in links]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+    return results
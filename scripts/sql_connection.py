@@ -24,7 +24,4 @@ else:
 
 # Create a SQLAlchemy engine
 connection_string = f"mssql+pyodbc://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}?driver=ODBC+Driver+17+for+SQL+Server&fast_executemany=True"
-engine = create_engine(connection_string)
-
-# Create a connection object
-Conn = engine.connect()
\ No newline at end of file
+engine = create_engine(connection_string)
\ No newline at end of file
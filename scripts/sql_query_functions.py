@@ -1,11 +1,11 @@
-from scripts.sql_connection import Conn, engine
+from scripts.sql_connection import engine
 import pandas as pd
 
 # SQL Query
 def SQL_query(query):
-    result_proxy = Conn.execute(query)
-    result_df = pd.DataFrame(result_proxy.fetchall(), columns=result_proxy.keys())
-    engine.dispose
+    with engine.connect() as conn:
+        result_proxy = conn.execute(query)
+        result_df = pd.DataFrame(result_proxy.fetchall(), columns=result_proxy.keys())
     return result_df
 
 # Count Query